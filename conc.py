@@ -2,8 +2,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
+import re
 from dotenv import load_dotenv
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Explicitly load the .env file from the script directory first
 script_dir = Path(__file__).parent
@@ -11,50 +13,68 @@ env_path = script_dir / '.env'
 print(f"Explicitly loading .env file from: {env_path.absolute()}")
 load_dotenv(env_path, override=True)
 
+# Characters stripped from amount strings before numeric conversion
+_AMT_TRANS = str.maketrans('', '', ', \t\xa0')
+
+# Cell contents that count as empty when filtering blank rows
+_EMPTY_CELL_VALUES = ['', 'nan', 'NaN', 'None', 'null', '#N/A', 'N/A']
+
+# Status values, stored as categoricals (one small integer code per row)
+_STATUS_1_CATEGORIES = ['Unmatched_Stage1', 'Matched_Stage1']
+_STATUS_2_CATEGORIES = ['', 'Unmatched_Stage2', 'Matched_Stage2']
+
+# Header row detection: the row must mention a date and an amount column
+_HEADER_AMOUNT_RE = {
+    'bank': re.compile('credit|debit'),
+    'ledger': re.compile('debit'),
+}
+
+# Keywords that mark summary/total rows rather than transactions
+_SUMMARY_KEYWORDS = frozenset([
+    'total', 'grand total', 'sub total', 'subtotal', 'summary',
+    'closing balance', 'opening balance', 'balance c/f', 'balance b/f',
+    'overall total', 'balance forward', 'balance carried forward'
+])
+
+# Prefer XlsxWriter for the output workbook (streams cells instead of building an
+# in-memory openpyxl object tree); fall back to openpyxl when it is not installed
+try:
+    import xlsxwriter  # noqa: F401
+    _EXCEL_ENGINE = 'xlsxwriter'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
+
 def find_value_date_and_amount_columns(df, file_type):
     """
     Find Value Date and Credit/Debit columns in the dataframe.
     """
-    date_col = None
-    amount_col = None
-    
-    # Look for exact "Value Date" column
+    # Normalize column names once: stripped lowercase name -> first column with it,
+    # plus a compact form (no spaces/underscores) in column order for the fallbacks
+    normalized = {}
+    compact = []
     for col in df.columns:
-        if str(col).strip().lower() == 'value date':
-            date_col = col
-            break
+        name = str(col).strip().lower()
+        normalized.setdefault(name, col)
+        compact.append((name.replace(' ', '').replace('_', ''), col))
     
-    # If not found, check for common variations
+    def first_compact_match(candidates):
+        return next((col for name, col in compact if name in candidates), None)
+    
+    # Look for exact "Value Date" column, then common variations
+    date_col = normalized.get('value date')
     if date_col is None:
-        for col in df.columns:
-            col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-            if col_clean in ['valuedate', 'value_date', 'date', 'transdate', 'transactiondate']:
-                date_col = col
-                break
+        date_col = first_compact_match({'valuedate', 'value_date', 'date', 'transdate', 'transactiondate'})
     
     # Find Credit (for bank) or Debit (for ledger) column
+    amount_col = None
     if file_type == "bank":
-        for col in df.columns:
-            if str(col).strip().lower() == 'credit':
-                amount_col = col
-                break
+        amount_col = normalized.get('credit')
         if amount_col is None:
-            for col in df.columns:
-                col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-                if col_clean in ['credit', 'cr', 'credits', 'amount']:
-                    amount_col = col
-                    break
+            amount_col = first_compact_match({'credit', 'cr', 'credits', 'amount'})
     elif file_type == "ledger":
-        for col in df.columns:
-            if str(col).strip().lower() == 'debit':
-                amount_col = col
-                break
+        amount_col = normalized.get('debit')
         if amount_col is None:
-            for col in df.columns:
-                col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-                if col_clean in ['debit', 'dr', 'debits', 'withdrawal', 'amount']:
-                    amount_col = col
-                    break
+            amount_col = first_compact_match({'debit', 'dr', 'debits', 'withdrawal', 'amount'})
     
     return date_col, amount_col
 
@@ -63,7 +83,7 @@ def is_numeric_value(val):
     if pd.isna(val):
         return False
     
-    val_str = str(val).strip().replace(',', '').replace(' ', '')
+    val_str = str(val).strip().translate(_AMT_TRANS)
     
     # Check for empty or null strings
     if not val_str or val_str.lower() in ['', 'nan', 'none', 'null', '#n/a']:
@@ -76,6 +96,35 @@ def is_numeric_value(val):
     except (ValueError, TypeError):
         return False
 
+def _fast_to_datetime(values):
+    """
+    Parse a column of dates, converting each distinct value only once.
+    Statements repeat the same date across many rows, so parsing the uniques
+    and mapping them back by code avoids most of the per-row parsing.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(uniques, errors='coerce')
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index)
+
+def _read_excel(path, **kwargs):
+    """
+    Read an Excel file (.xlsx or .xls) with the faster calamine engine, falling
+    back to pandas' default engine when python-calamine is not installed.
+    """
+    try:
+        return pd.read_excel(path, engine='calamine', **kwargs)
+    except ImportError:
+        return pd.read_excel(path, **kwargs)
+
+def _read_any(path):
+    """
+    Read an Excel or CSV file without a header row, choosing the reader from
+    the file extension.
+    """
+    if path.lower().endswith('.xlsx') or path.lower().endswith('.xls'):
+        return _read_excel(path, header=None)
+    return pd.read_csv(path, header=None)
+
 def diagnose_missing_rows(df_data, amount_col, file_type):
     """
     Diagnose which rows are being excluded and why
@@ -211,18 +260,13 @@ def find_actual_data_rows(df, file_type):
     """
     # Find header rows by looking for "Value Date", "Credit", "Debit" keywords
     header_row = None
+    amount_re = _HEADER_AMOUNT_RE['bank' if file_type == "bank" else 'ledger']
     
     for i in range(min(50, len(df))):
-        row_values = df.iloc[i].astype(str).str.lower()
+        # Join the cells with a separator no keyword contains, so matches stay within a cell
+        row_joined = '\x00'.join(df.iloc[i].astype(str).str.lower())
         
-        has_date = any('date' in val for val in row_values)
-        
-        if file_type == "bank":
-            has_amount = any('credit' in val or 'debit' in val for val in row_values)
-        else:  # ledger
-            has_amount = any('debit' in val for val in row_values)
-        
-        if has_date and has_amount:
+        if 'date' in row_joined and amount_re.search(row_joined):
             header_row = i
             break
 
@@ -235,66 +279,55 @@ def find_actual_data_rows(df, file_type):
     df_with_headers.columns = df_with_headers.iloc[0]
     df_data = df_with_headers.iloc[1:].reset_index(drop=True)
     
+    # Materialize the cell values once; they drive both the empty-row and summary filters
+    values = df_data.to_numpy(dtype=object)
+    present = pd.notna(values)
+    
     # STRICT EMPTY ROW FILTERING
-    # Filter out completely empty rows (all NaN or all whitespace)
-    def is_row_empty(row):
-        """Check if a row is completely empty (all NaN or whitespace)"""
-        for val in row.values:
-            if pd.notna(val):
-                val_str = str(val).strip()
-                # Check if it's not just whitespace or common empty representations
-                if val_str and val_str not in ['', 'nan', 'NaN', 'None', 'null', '#N/A', 'N/A']:
-                    return False
-        return True
+    # Filter out completely empty rows (all NaN or all whitespace), one column at a time
+    blank = ~present
+    for j in range(values.shape[1]):
+        blank[:, j] |= pd.Series(values[:, j], dtype=object).astype(str).str.strip().isin(_EMPTY_CELL_VALUES).to_numpy()
+    empty_mask = blank.all(axis=1)
     
     # Apply empty row filter
-    empty_mask = df_data.apply(is_row_empty, axis=1)
     rows_before = len(df_data)
     df_data = df_data[~empty_mask].reset_index(drop=True)
+    values, present = values[~empty_mask], present[~empty_mask]
     rows_removed = rows_before - len(df_data)
     
     if rows_removed > 0:
         print(f"   Removed {rows_removed} completely empty rows")
     
     # Filter out rows that are likely summaries or totals
-    summary_keywords = [
-        'total', 'grand total', 'sub total', 'subtotal', 'summary', 
-        'closing balance', 'opening balance', 'balance c/f', 'balance b/f', 
-        'overall total', 'balance forward', 'balance carried forward'
-    ]
-    
-    non_summary_mask = pd.Series([True] * len(df_data), index=df_data.index)
-    
-    for idx, row in df_data.iterrows():
-        row_str = ' '.join(str(val) for val in row.values if pd.notna(val))
-        row_str_lower = row_str.lower()
-        
-        is_summary = False
-        for keyword in summary_keywords:
-            if keyword in row_str_lower:
-                # For short rows or rows where keyword appears as a standalone word
-                clean_row_str = ' '.join(row_str_lower.split())
-                if len(clean_row_str) < 50 or f' {keyword} ' in f' {clean_row_str} ':
-                    is_summary = True
-                    break
-        
-        if is_summary:
-            non_summary_mask[idx] = False
+    # Join each row's non-empty cells into one lowercase string, built once
+    row_str_lower = pd.Series(
+        [' '.join(map(str, row[mask])) for row, mask in zip(values, present)],
+        index=df_data.index, dtype=object
+    ).str.lower()
+    clean_row_str = row_str_lower.str.split().str.join(' ')
+    padded_row_str = ' ' + clean_row_str + ' '
+    is_short = (clean_row_str.str.len() < 50).to_numpy(dtype=bool)
+    
+    # A keyword marks a summary in short rows, or anywhere it appears as a standalone word
+    # (one literal scan per keyword, OR-reduced in numpy)
+    is_summary = np.logical_or.reduce([
+        row_str_lower.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+        & (is_short | padded_row_str.str.contains(f' {keyword} ', regex=False).to_numpy(dtype=bool))
+        for keyword in _SUMMARY_KEYWORDS
+    ])
+    non_summary_mask = ~is_summary
     
     # ENHANCED AMOUNT VALIDATION WITH DIAGNOSTICS
-    valid_amount_mask = pd.Series([False] * len(df_data), index=df_data.index)
+    valid_amount_mask = np.zeros(len(df_data), dtype=bool)
+    
+    # Lowercase column names, computed once for the amount column lookups
+    lower_cols = [(str(col).lower(), col) for col in df_data.columns]
     
     if file_type == "bank":
         # For bank statements, check ONLY Credit column
-        credit_col = None
-        debit_col = None
-        
-        for col in df_data.columns:
-            col_lower = str(col).lower()
-            if 'credit' in col_lower and credit_col is None:
-                credit_col = col
-            if 'debit' in col_lower and debit_col is None:
-                debit_col = col
+        credit_col = next((col for name, col in lower_cols if 'credit' in name), None)
+        debit_col = next((col for name, col in lower_cols if 'debit' in name), None)
         
         print(f"   Bank Credit Column: {credit_col}")
         print(f"   Bank Debit Column: {debit_col} (separate, not used for matching)")
@@ -304,9 +337,7 @@ def find_actual_data_rows(df, file_type):
             valid_count, invalid_count, rows_with_data = diagnose_missing_rows(df_data, credit_col, "bank")
             
             # Apply validation
-            for idx in df_data.index:
-                if is_numeric_value(df_data.loc[idx, credit_col]):
-                    valid_amount_mask[idx] = True
+            valid_amount_mask = df_data[credit_col].map(is_numeric_value).to_numpy(dtype=bool)
         
         print(f"\n   ✓ Total rows with valid Credit amounts: {valid_amount_mask.sum()}")
         print(f"   ✓ Target: 3778 rows with Credit")
@@ -314,11 +345,7 @@ def find_actual_data_rows(df, file_type):
         
     else:  # file_type == "ledger"
         # For ledgers, check Debit column
-        debit_col = None
-        for col in df_data.columns:
-            if 'debit' in str(col).lower():
-                debit_col = col
-                break
+        debit_col = next((col for name, col in lower_cols if 'debit' in name), None)
         
         print(f"   Ledger Debit Column: {debit_col}")
         
@@ -327,9 +354,7 @@ def find_actual_data_rows(df, file_type):
             valid_count, invalid_count, rows_with_data = diagnose_missing_rows(df_data, debit_col, "ledger")
             
             # Apply validation
-            for idx in df_data.index:
-                if is_numeric_value(df_data.loc[idx, debit_col]):
-                    valid_amount_mask[idx] = True
+            valid_amount_mask = df_data[debit_col].map(is_numeric_value).to_numpy(dtype=bool)
     
     # Final mask: non-summary rows with valid amounts
     final_mask = non_summary_mask & valid_amount_mask
@@ -340,77 +365,63 @@ def find_actual_data_rows(df, file_type):
     print(f"   Rows with valid amounts: {valid_amount_mask.sum()}")
     print(f"   Final valid rows: {final_mask.sum()}")
     
-    return df_data[final_mask], header_row
+    return df_data.iloc[final_mask], header_row
+
+
+def _precompute_keys(df, date_col, amount_col):
+    """
+    Build the match keys for a frame once so both stages can reuse them.
+    Returns match_date (int64 day number) and match_amount (int64 cents)
+    indexed like df, keeping only rows with a valid date and amount.
+    """
+    clean_date = _fast_to_datetime(df[date_col])
+    internal_amount = pd.to_numeric(df[amount_col].astype(str).str.translate(_AMT_TRANS), errors='coerce')
+    amount = np.abs(internal_amount.to_numpy(dtype=np.float64))
+    
+    # Filter out rows with NaT dates or NaN amounts
+    valid = clean_date.notna().to_numpy() & np.isfinite(amount)
+    
+    # Integer keys only: dates as day numbers (no strftime or string hashing) and
+    # amounts as whole cents (exact equality, no float rounding noise)
+    return pd.DataFrame({
+        'match_date': clean_date.to_numpy()[valid].astype('datetime64[D]').view('int64'),
+        'match_amount': np.rint(amount[valid] * 100).astype(np.int64),
+    }, index=df.index[valid])
 
 
-def perform_matching(bank_df, ledger_df, bank_date_col, bank_credit_col, ledger_date_col, ledger_debit_col, stage_number):
+def perform_matching(bank_keys, ledger_keys, stage_number):
     """
     Perform matching between bank and ledger for a specific stage.
+    Takes the key frames built by _precompute_keys.
     Returns matched indices for both bank and ledger.
     """
-    # Create copies to avoid modifying originals
-    bank_work = bank_df.copy()
-    ledger_work = ledger_df.copy()
-    
-    # Convert date columns to datetime
-    bank_work['clean_date'] = pd.to_datetime(bank_work[bank_date_col], errors='coerce')
-    ledger_work['clean_date'] = pd.to_datetime(ledger_work[ledger_date_col], errors='coerce')
-    
-    # Convert amount columns to numeric (handle commas and spaces)
-    bank_work['internal_amount'] = pd.to_numeric(
-        bank_work[bank_credit_col].astype(str).str.replace(',', '').str.replace(' ', ''), 
-        errors='coerce'
+    # Nothing can match when either side has no valid rows
+    if len(bank_keys) == 0 or len(ledger_keys) == 0:
+        return [], []
+    
+    # Implement one-to-one matching: number the repeats of each (date, amount) key on
+    # both sides, so the n-th bank row with a key pairs with the n-th ledger row.
+    # The merge inputs are built in one step from the key frames (no copy + insert)
+    bank_temp = bank_keys.assign(
+        original_bank_index=bank_keys.index,
+        match_seq=bank_keys.groupby(['match_date', 'match_amount']).cumcount()
     )
-    ledger_work['internal_amount'] = pd.to_numeric(
-        ledger_work[ledger_debit_col].astype(str).str.replace(',', '').str.replace(' ', ''), 
-        errors='coerce'
+    ledger_temp = ledger_keys.assign(
+        original_ledger_index=ledger_keys.index,
+        match_seq=ledger_keys.groupby(['match_date', 'match_amount']).cumcount()
     )
     
-    # Create match keys
-    bank_work['match_date'] = bank_work['clean_date'].dt.strftime('%Y-%m-%d')
-    ledger_work['match_date'] = ledger_work['clean_date'].dt.strftime('%Y-%m-%d')
-    
-    bank_work['match_amount'] = bank_work['internal_amount'].abs().round(2)
-    ledger_work['match_amount'] = ledger_work['internal_amount'].abs().round(2)
-    
-    # Store original indices
-    bank_work['original_bank_index'] = bank_work.index
-    ledger_work['original_ledger_index'] = ledger_work.index
-    
-    # Filter out rows with NaT dates or NaN amounts
-    bank_valid = bank_work.dropna(subset=['match_date', 'match_amount'])
-    ledger_valid = ledger_work.dropna(subset=['match_date', 'match_amount'])
-    
-    # Create temporary DataFrames for matching
-    bank_temp = bank_valid[['match_date', 'match_amount', 'original_bank_index']].copy()
-    ledger_temp = ledger_valid[['match_date', 'match_amount', 'original_ledger_index']].copy()
-    
-    # Perform the merge to find ALL possible matches
-    all_matches = pd.merge(
+    matches = pd.merge(
         bank_temp,
         ledger_temp,
-        on=['match_date', 'match_amount'],
-        how='inner',
-        suffixes=('_bank', '_ledger')
+        on=['match_date', 'match_amount', 'match_seq'],
+        how='inner'
     )
     
-    # Implement one-to-one matching
-    matched_bank_indices = set()
-    matched_ledger_indices = set()
+    matched_bank_indices = matches['original_bank_index'].to_numpy()
+    matched_ledger_indices = matches['original_ledger_index'].to_numpy()
     
-    # Handle column names
-    bank_idx_col = 'original_bank_index' if 'original_bank_index' in all_matches.columns else 'original_bank_index_bank'
-    ledger_idx_col = 'original_ledger_index' if 'original_ledger_index' in all_matches.columns else 'original_ledger_index_ledger'
-    
-    for _, match_row in all_matches.iterrows():
-        bank_idx = match_row[bank_idx_col]
-        ledger_idx = match_row[ledger_idx_col]
-        
-        if bank_idx not in matched_bank_indices and ledger_idx not in matched_ledger_indices:
-            matched_bank_indices.add(bank_idx)
-            matched_ledger_indices.add(ledger_idx)
-    
-    return list(matched_bank_indices), list(matched_ledger_indices)
+    return matched_bank_indices.tolist(), matched_ledger_indices.tolist()
 
 
 def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file):
@@ -428,22 +439,17 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
     
     # ========== LOAD ALL FILES ==========
     print(f"\nLoading Bank Statement: {bank_file}")
-    if bank_file.lower().endswith('.xlsx') or bank_file.lower().endswith('.xls'):
-        bank_df_raw = pd.read_excel(bank_file, header=None)
-    else:
-        bank_df_raw = pd.read_csv(bank_file, header=None)
-    
     print(f"Loading Primary Ledger: {ledger1_file}")
-    if ledger1_file.lower().endswith('.xlsx') or ledger1_file.lower().endswith('.xls'):
-        ledger1_df_raw = pd.read_excel(ledger1_file, header=None)
-    else:
-        ledger1_df_raw = pd.read_csv(ledger1_file, header=None)
-    
     print(f"Loading Secondary/General Ledger: {ledger2_file}")
-    if ledger2_file.lower().endswith('.xlsx') or ledger2_file.lower().endswith('.xls'):
-        ledger2_df_raw = pd.read_excel(ledger2_file, header=None)
-    else:
-        ledger2_df_raw = pd.read_csv(ledger2_file, header=None)
+    
+    # The three files are independent, so read them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        bank_future = executor.submit(_read_any, bank_file)
+        ledger1_future = executor.submit(_read_any, ledger1_file)
+        ledger2_future = executor.submit(_read_any, ledger2_file)
+        bank_df_raw = bank_future.result()
+        ledger1_df_raw = ledger1_future.result()
+        ledger2_df_raw = ledger2_future.result()
     
     # ========== EXTRACT TRANSACTION DATA ==========
     print("\nExtracting transaction data...")
@@ -460,31 +466,34 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
     ledger1_date_col, ledger1_debit_col = find_value_date_and_amount_columns(ledger1_df, "ledger")
     ledger2_date_col, ledger2_debit_col = find_value_date_and_amount_columns(ledger2_df, "ledger")
     
-    if not all([bank_date_col, bank_credit_col, ledger1_date_col, ledger1_debit_col, ledger2_date_col, ledger2_debit_col]):
+    if None in (bank_date_col, bank_credit_col, ledger1_date_col, ledger1_debit_col, ledger2_date_col, ledger2_debit_col):
         print("❌ ERROR: Could not find required columns in one or more files")
         print(f"   Bank: Date={bank_date_col}, Credit={bank_credit_col}")
         print(f"   Ledger1: Date={ledger1_date_col}, Debit={ledger1_debit_col}")
         print(f"   Ledger2: Date={ledger2_date_col}, Debit={ledger2_debit_col}")
         return
     
+    # ========== BUILD MATCH KEYS ==========
+    bank_keys = _precompute_keys(bank_df, bank_date_col, bank_credit_col)
+    ledger1_keys = _precompute_keys(ledger1_df, ledger1_date_col, ledger1_debit_col)
+    ledger2_keys = _precompute_keys(ledger2_df, ledger2_date_col, ledger2_debit_col)
+    
     # ========== STAGE 1: BANK vs LEDGER 1 ==========
     print("\n" + "="*70)
     print("STAGE 1: Matching Bank Statement with Primary Ledger")
     print("="*70)
     
     matched_bank_stage1, matched_ledger1 = perform_matching(
-        bank_df, ledger1_df,
-        bank_date_col, bank_credit_col,
-        ledger1_date_col, ledger1_debit_col,
+        bank_keys, ledger1_keys,
         stage_number=1
     )
     
     # Initialize Status_1 for all dataframes
-    bank_df['Status_1'] = 'Unmatched_Stage1'
-    bank_df.loc[matched_bank_stage1, 'Status_1'] = 'Matched_Stage1'
+    bank_df['Status_1'] = pd.Categorical.from_codes(
+        bank_df.index.isin(matched_bank_stage1).astype(np.int8), categories=_STATUS_1_CATEGORIES)
     
-    ledger1_df['Status_1'] = 'Unmatched_Stage1'
-    ledger1_df.loc[matched_ledger1, 'Status_1'] = 'Matched_Stage1'
+    ledger1_df['Status_1'] = pd.Categorical.from_codes(
+        ledger1_df.index.isin(matched_ledger1).astype(np.int8), categories=_STATUS_1_CATEGORIES)
     
     # Stage 1 results
     total_bank = len(bank_df)
@@ -502,19 +511,19 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
     print("="*70)
     
     bank_unmatched_stage1 = bank_df[bank_df['Status_1'] == 'Unmatched_Stage1'].copy()
-    bank_df['Status_2'] = ''
+    bank_df['Status_2'] = pd.Categorical.from_codes(
+        np.zeros(len(bank_df), dtype=np.int8), categories=_STATUS_2_CATEGORIES)
     
     if len(bank_unmatched_stage1) == 0:
         print("[SUCCESS] All bank records matched in Stage 1. No Stage 2 needed.")
         matched_stage2_count = 0
         unmatched_stage2_count = 0
         matched_ledger2 = []
-        ledger2_df['Status_2'] = ''
+        ledger2_df['Status_2'] = pd.Categorical.from_codes(
+            np.zeros(len(ledger2_df), dtype=np.int8), categories=_STATUS_2_CATEGORIES)
     else:
         matched_bank_stage2_indices, matched_ledger2 = perform_matching(
-            bank_unmatched_stage1, ledger2_df,
-            bank_date_col, bank_credit_col,
-            ledger2_date_col, ledger2_debit_col,
+            bank_keys[bank_keys.index.isin(bank_unmatched_stage1.index)], ledger2_keys,
             stage_number=2
         )
         
@@ -522,9 +531,8 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
         if matched_bank_stage2_indices:
             bank_df.loc[matched_bank_stage2_indices, 'Status_2'] = 'Matched_Stage2'
         
-        ledger2_df['Status_2'] = 'Unmatched_Stage2'
-        if matched_ledger2:
-            ledger2_df.loc[matched_ledger2, 'Status_2'] = 'Matched_Stage2'
+        ledger2_df['Status_2'] = pd.Categorical.from_codes(
+            1 + ledger2_df.index.isin(matched_ledger2).astype(np.int8), categories=_STATUS_2_CATEGORIES)
         
         matched_stage2_count = len(matched_bank_stage2_indices)
         unmatched_stage2_count = unmatched_stage1_count - matched_stage2_count
@@ -564,44 +572,43 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
         df['  '] = ''
         df['   '] = ''
     
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_file, engine=_EXCEL_ENGINE) as writer:
         # Summary sheet
         ledger1_unmatched = len(ledger1_df) - len(matched_ledger1)
         ledger2_unmatched = len(ledger2_df) - len(matched_ledger2)
         
         summary_data = [
-            {'Metric': 'BANK STATEMENT SUMMARY', 'Value': ''},
-            {'Metric': 'Total Bank Statement Records', 'Value': total_bank},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'STAGE 1: Matching with Primary Ledger', 'Value': ''},
-            {'Metric': 'Matched with Ledger 1', 'Value': matched_stage1_count},
-            {'Metric': 'Unmatched with Ledger 1', 'Value': unmatched_stage1_count},
-            {'Metric': 'Stage 1 Match Rate', 'Value': f"{(matched_stage1_count/total_bank*100) if total_bank > 0 else 0:.2f}%"},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'STAGE 2: Matching Unmatched with Secondary Ledger', 'Value': ''},
-            {'Metric': 'Matched with Ledger 2', 'Value': matched_stage2_count},
-            {'Metric': 'Still Unmatched after Stage 2', 'Value': unmatched_stage2_count},
-            {'Metric': 'Stage 2 Match Rate', 'Value': f"{(matched_stage2_count/unmatched_stage1_count*100) if unmatched_stage1_count > 0 else 0:.2f}%"},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'OVERALL BANK RECONCILIATION', 'Value': ''},
-            {'Metric': 'Total Matched (Stage 1 + Stage 2)', 'Value': matched_stage1_count + matched_stage2_count},
-            {'Metric': 'Total Unmatched', 'Value': unmatched_stage2_count},
-            {'Metric': 'Overall Match Rate', 'Value': f"{((matched_stage1_count + matched_stage2_count)/total_bank*100) if total_bank > 0 else 0:.2f}%"},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'PRIMARY LEDGER (LEDGER 1) SUMMARY', 'Value': ''},
-            {'Metric': 'Total Ledger 1 Records', 'Value': len(ledger1_df)},
-            {'Metric': 'Matched with Bank Statement', 'Value': len(matched_ledger1)},
-            {'Metric': 'Unmatched with Bank Statement', 'Value': ledger1_unmatched},
-            {'Metric': 'Ledger 1 Match Rate', 'Value': f"{(len(matched_ledger1)/len(ledger1_df)*100) if len(ledger1_df) > 0 else 0:.2f}%"},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'SECONDARY LEDGER (LEDGER 2) SUMMARY', 'Value': ''},
-            {'Metric': 'Total Ledger 2 Records', 'Value': len(ledger2_df)},
-            {'Metric': 'Matched with Bank Statement', 'Value': len(matched_ledger2)},
-            {'Metric': 'Unmatched with Bank Statement', 'Value': ledger2_unmatched},
-            {'Metric': 'Ledger 2 Match Rate', 'Value': f"{(len(matched_ledger2)/len(ledger2_df)*100) if len(ledger2_df) > 0 else 0:.2f}%"},
+            ('BANK STATEMENT SUMMARY', ''),
+            ('Total Bank Statement Records', total_bank),
+            ('', ''),
+            ('STAGE 1: Matching with Primary Ledger', ''),
+            ('Matched with Ledger 1', matched_stage1_count),
+            ('Unmatched with Ledger 1', unmatched_stage1_count),
+            ('Stage 1 Match Rate', f"{(matched_stage1_count/total_bank*100) if total_bank > 0 else 0:.2f}%"),
+            ('', ''),
+            ('STAGE 2: Matching Unmatched with Secondary Ledger', ''),
+            ('Matched with Ledger 2', matched_stage2_count),
+            ('Still Unmatched after Stage 2', unmatched_stage2_count),
+            ('Stage 2 Match Rate', f"{(matched_stage2_count/unmatched_stage1_count*100) if unmatched_stage1_count > 0 else 0:.2f}%"),
+            ('', ''),
+            ('OVERALL BANK RECONCILIATION', ''),
+            ('Total Matched (Stage 1 + Stage 2)', matched_stage1_count + matched_stage2_count),
+            ('Total Unmatched', unmatched_stage2_count),
+            ('Overall Match Rate', f"{((matched_stage1_count + matched_stage2_count)/total_bank*100) if total_bank > 0 else 0:.2f}%"),
+            ('', ''),
+            ('PRIMARY LEDGER (LEDGER 1) SUMMARY', ''),
+            ('Total Ledger 1 Records', len(ledger1_df)),
+            ('Matched with Bank Statement', len(matched_ledger1)),
+            ('Unmatched with Bank Statement', ledger1_unmatched),
+            ('Ledger 1 Match Rate', f"{(len(matched_ledger1)/len(ledger1_df)*100) if len(ledger1_df) > 0 else 0:.2f}%"),
+            ('', ''),
+            ('SECONDARY LEDGER (LEDGER 2) SUMMARY', ''),
+            ('Total Ledger 2 Records', len(ledger2_df)),
+            ('Matched with Bank Statement', len(matched_ledger2)),
+            ('Unmatched with Bank Statement', ledger2_unmatched),
+            ('Ledger 2 Match Rate', f"{(len(matched_ledger2)/len(ledger2_df)*100) if len(ledger2_df) > 0 else 0:.2f}%"),
         ]
-        summary_df = pd.DataFrame.from_records(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        pd.DataFrame(summary_data, columns=['Metric', 'Value']).to_excel(writer, sheet_name='Summary', index=False)
         
         # Prepare columns for export
         def prepare_columns(df):
@@ -618,25 +625,33 @@ def two_stage_reconciliation(bank_file, ledger1_file, ledger2_file, output_file)
             else:
                 return cols + [' ', '  ', '   ']
         
-        # Bank sheets
-        bank_cols = prepare_columns(bank_df)
-        bank_df[bank_cols].to_excel(writer, sheet_name='Bank Statement (All)', index=False)
-        bank_df[bank_df['Status_1'] == 'Matched_Stage1'][bank_cols].to_excel(writer, sheet_name='Bank - Matched_Stage1', index=False)
-        bank_df[bank_df['Status_1'] == 'Unmatched_Stage1'][bank_cols].to_excel(writer, sheet_name='Bank - Unmatched_Stage1', index=False)
-        bank_df[bank_df['Status_2'] == 'Matched_Stage2'][bank_cols].to_excel(writer, sheet_name='Bank - Matched_Stage2', index=False)
-        bank_df[bank_df['Status_2'] == 'Unmatched_Stage2'][bank_cols].to_excel(writer, sheet_name='Bank - Unmatched_Stage2', index=False)
+        # Each sheet is sliced on the Status category codes rather than the labels
+        status_1_code = {name: code for code, name in enumerate(_STATUS_1_CATEGORIES)}
+        status_2_code = {name: code for code, name in enumerate(_STATUS_2_CATEGORIES)}
+        
+        # Bank sheets (columns projected once, each sheet sliced with a precomputed mask)
+        bank_out = bank_df[prepare_columns(bank_df)]
+        bank_status_1 = bank_df['Status_1'].cat.codes.to_numpy()
+        bank_status_2 = bank_df['Status_2'].cat.codes.to_numpy()
+        bank_out.to_excel(writer, sheet_name='Bank Statement (All)', index=False)
+        bank_out[bank_status_1 == status_1_code['Matched_Stage1']].to_excel(writer, sheet_name='Bank - Matched_Stage1', index=False)
+        bank_out[bank_status_1 == status_1_code['Unmatched_Stage1']].to_excel(writer, sheet_name='Bank - Unmatched_Stage1', index=False)
+        bank_out[bank_status_2 == status_2_code['Matched_Stage2']].to_excel(writer, sheet_name='Bank - Matched_Stage2', index=False)
+        bank_out[bank_status_2 == status_2_code['Unmatched_Stage2']].to_excel(writer, sheet_name='Bank - Unmatched_Stage2', index=False)
         
         # Ledger 1 sheets
-        ledger1_cols = prepare_columns(ledger1_df)
-        ledger1_df[ledger1_cols].to_excel(writer, sheet_name='Ledger 1 (All)', index=False)
-        ledger1_df[ledger1_df['Status_1'] == 'Matched_Stage1'][ledger1_cols].to_excel(writer, sheet_name='Ledger 1 - Matched_Stage1', index=False)
-        ledger1_df[ledger1_df['Status_1'] == 'Unmatched_Stage1'][ledger1_cols].to_excel(writer, sheet_name='Ledger 1 - Unmatched_Stage1', index=False)
+        ledger1_out = ledger1_df[prepare_columns(ledger1_df)]
+        ledger1_status_1 = ledger1_df['Status_1'].cat.codes.to_numpy()
+        ledger1_out.to_excel(writer, sheet_name='Ledger 1 (All)', index=False)
+        ledger1_out[ledger1_status_1 == status_1_code['Matched_Stage1']].to_excel(writer, sheet_name='Ledger 1 - Matched_Stage1', index=False)
+        ledger1_out[ledger1_status_1 == status_1_code['Unmatched_Stage1']].to_excel(writer, sheet_name='Ledger 1 - Unmatched_Stage1', index=False)
         
         # Ledger 2 sheets
-        ledger2_cols = prepare_columns(ledger2_df)
-        ledger2_df[ledger2_cols].to_excel(writer, sheet_name='Ledger 2 (All)', index=False)
-        ledger2_df[ledger2_df['Status_2'] == 'Matched_Stage2'][ledger2_cols].to_excel(writer, sheet_name='Ledger 2 - Matched_Stage2', index=False)
-        ledger2_df[ledger2_df['Status_2'] == 'Unmatched_Stage2'][ledger2_cols].to_excel(writer, sheet_name='Ledger 2 - Unmatched_Stage2', index=False)
+        ledger2_out = ledger2_df[prepare_columns(ledger2_df)]
+        ledger2_status_2 = ledger2_df['Status_2'].cat.codes.to_numpy()
+        ledger2_out.to_excel(writer, sheet_name='Ledger 2 (All)', index=False)
+        ledger2_out[ledger2_status_2 == status_2_code['Matched_Stage2']].to_excel(writer, sheet_name='Ledger 2 - Matched_Stage2', index=False)
+        ledger2_out[ledger2_status_2 == status_2_code['Unmatched_Stage2']].to_excel(writer, sheet_name='Ledger 2 - Unmatched_Stage2', index=False)
     
     print("\n[SUCCESS] Results saved successfully!")
     print("\n[INFO] Output file contains:")
@@ -1,20 +1,128 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import date, datetime
 import os
 import logging
+import argparse
+from collections import defaultdict, deque
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# Combined bank + ledger rows above which the Numba matcher beats its import and load cost
+_JIT_MIN_ROWS = 500_000
+
+# Cell values pd.read_csv treats as missing by default
+_CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                  '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
 # Load environment variables from .env file
 load_dotenv()
 
+
+def _greedy_match(bank_codes, ledger_codes):
+    """
+    Pair bank and ledger rows one-to-one on shared integer key codes.
+    
+    Each bank row, in order, takes the first ledger row with the same code that
+    has not been matched yet, so repeated (date, amount) pairs match at most
+    once per side in O(N + M). Large inputs use the Numba-compiled matcher
+    when numba is installed.
+    
+    Args:
+        bank_codes (np.ndarray): Key code per bank row
+        ledger_codes (np.ndarray): Key code per ledger row
+        
+    Returns:
+        tuple: (bank_matched_idx, ledger_matched_idx) int64 position arrays
+    """
+    greedy_match_jit = None
+    if len(bank_codes) + len(ledger_codes) >= _JIT_MIN_ROWS:
+        greedy_match_jit = _load_greedy_match_jit()
+    if greedy_match_jit is not None:
+        return greedy_match_jit(
+            np.ascontiguousarray(bank_codes, dtype=np.int64),
+            np.ascontiguousarray(ledger_codes, dtype=np.int64),
+        )
+    
+    buckets = defaultdict(deque)
+    for j, code in enumerate(ledger_codes.tolist()):
+        buckets[code].append(j)
+    
+    bank_matched_idx = []
+    ledger_matched_idx = []
+    for i, code in enumerate(bank_codes.tolist()):
+        bucket = buckets.get(code)
+        if bucket:
+            bank_matched_idx.append(i)
+            ledger_matched_idx.append(bucket.popleft())
+    
+    return np.asarray(bank_matched_idx, dtype=np.int64), np.asarray(ledger_matched_idx, dtype=np.int64)
+
+
+def _greedy_match_kernel(bank_codes, ledger_codes):
+    """
+    Loop body of _greedy_match for dense, non-negative key codes, compiled
+    with Numba by _load_greedy_match_jit.
+    """
+    n_codes = 0
+    for c in bank_codes:
+        n_codes = max(n_codes, c + 1)
+    for c in ledger_codes:
+        n_codes = max(n_codes, c + 1)
+    
+    # Group ledger positions by code (counting sort keeps their original order)
+    starts = np.zeros(n_codes + 1, np.int64)
+    for c in ledger_codes:
+        starts[c + 1] += 1
+    for k in range(n_codes):
+        starts[k + 1] += starts[k]
+    order = np.empty(ledger_codes.shape[0], np.int64)
+    cursor = starts[:-1].copy()
+    for j in range(ledger_codes.shape[0]):
+        c = ledger_codes[j]
+        order[cursor[c]] = j
+        cursor[c] += 1
+    
+    # Each bank row takes the next unused ledger position with its code
+    cursor = starts[:-1].copy()
+    n = min(bank_codes.shape[0], ledger_codes.shape[0])
+    bank_matched_idx = np.empty(n, np.int64)
+    ledger_matched_idx = np.empty(n, np.int64)
+    k = 0
+    for i in range(bank_codes.shape[0]):
+        c = bank_codes[i]
+        if cursor[c] < starts[c + 1]:
+            bank_matched_idx[k] = i
+            ledger_matched_idx[k] = order[cursor[c]]
+            cursor[c] += 1
+            k += 1
+    
+    return bank_matched_idx[:k], ledger_matched_idx[:k]
+
+
+@lru_cache(maxsize=None)
+def _load_greedy_match_jit():
+    """
+    Compile (or load from Numba's on-disk cache) the matcher on first use, so
+    runs too small to benefit never import numba.
+    
+    Returns:
+        callable or None: The compiled matcher, or None when numba is not installed
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_greedy_match_kernel)
+
+
 class ReconciliationScript:
     """
     A comprehensive bank reconciliation script that matches bank statement records 
     with ledger records and outputs a detailed Excel workbook.
     """
     
-    def __init__(self, bank_file_path, ledger_file_path, output_file_path):
+    def __init__(self, bank_file_path, ledger_file_path, output_file_path, minimal=False):
         """
         Initialize the reconciliation script with file paths.
         
@@ -22,10 +130,13 @@ class ReconciliationScript:
             bank_file_path (str): Path to the bank statement file (Excel/CSV)
             ledger_file_path (str): Path to the ledger file (Excel/CSV)
             output_file_path (str): Path for the output Excel workbook
+            minimal (bool): Load only the date/credit/debit columns, so the output
+                workbook carries just those columns plus Status
         """
         self.bank_file_path = bank_file_path
         self.ledger_file_path = ledger_file_path
         self.output_file_path = output_file_path
+        self.minimal = minimal
         
         # Default column names
         self.bank_date_col = 'Value Date'
@@ -48,6 +159,203 @@ class ReconciliationScript:
         # Summary statistics
         self.summary_stats = {}
     
+    def _read_excel(self, path, **kwargs):
+        """
+        Read an Excel file with the Rust-backed calamine engine, falling back to
+        pandas' default engine when python-calamine is not installed.
+        
+        Args:
+            path (str): Path to the Excel file
+            **kwargs: Extra keyword arguments passed to pd.read_excel
+            
+        Returns:
+            pd.DataFrame: The loaded sheet
+        """
+        try:
+            return pd.read_excel(path, engine='calamine', **kwargs)
+        except ImportError:
+            return pd.read_excel(path, **kwargs)
+    
+    def _read_csv(self, path, quiet=False, **kwargs):
+        """
+        Read a CSV file, trying several encodings in turn. Each attempt uses the
+        multithreaded PyArrow parser and falls back to pandas' default engine
+        when pyarrow is not installed or rejects the file.
+        
+        Args:
+            path (str): Path to the CSV file
+            quiet (bool): Don't report which encoding was used
+            **kwargs: Extra keyword arguments passed to pd.read_csv
+            
+        Returns:
+            pd.DataFrame: The loaded data
+        """
+        encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+        for encoding in encodings:
+            try:
+                try:
+                    df = pd.read_csv(path, encoding=encoding, engine='pyarrow', **kwargs)
+                    # PyArrow returns undecodable columns as raw bytes instead of raising
+                    if self._has_undecoded_bytes(df):
+                        continue
+                    df = self._restore_date_text(path, encoding, df)
+                    df.columns = self._c_engine_header(path, encoding, df.columns, kwargs.get('usecols'))
+                except (ImportError, ValueError, KeyError):
+                    df = pd.read_csv(path, encoding=encoding, **kwargs)
+                if not quiet:
+                    print(f"Successfully loaded CSV with {encoding} encoding")
+                return df
+            except UnicodeDecodeError:
+                continue
+        raise ValueError("Could not load CSV file with any of the attempted encodings")
+    
+    @staticmethod
+    def _c_engine_header(path, encoding, columns, usecols):
+        """
+        Get the column names pandas' default CSV engine would give a PyArrow read.
+        
+        PyArrow keeps blank and repeated header cells as-is, while the default
+        engine names them 'Unnamed: N' and 'name.1', 'name.2', ...
+        
+        Args:
+            path (str): Path to the CSV file
+            encoding (str): Encoding the file was read with
+            columns (pd.Index): Column names returned by the PyArrow reader
+            usecols (list): Column names the file was read with, if any
+            
+        Returns:
+            list: Column names matching the default engine
+            
+        Raises:
+            ValueError: If the PyArrow columns can't be mapped onto that header
+        """
+        if usecols is not None:
+            # Selected names were taken from the default engine's header already
+            if list(columns) != list(usecols):
+                raise ValueError("PyArrow columns differ from the requested usecols")
+            return list(columns)
+        header = pd.read_csv(path, encoding=encoding, nrows=0).columns
+        if len(header) != len(columns):
+            raise ValueError("PyArrow and default engine disagree on the number of columns")
+        return list(header)
+    
+    @staticmethod
+    def _restore_date_text(path, encoding, df):
+        """
+        Put back the original text of columns PyArrow parsed as dates.
+        
+        PyArrow turns ISO dates and timestamps into date/datetime values, while
+        the default engine keeps them as strings, so those columns are re-read
+        from the file as text.
+        
+        Args:
+            path (str): Path to the CSV file
+            encoding (str): Encoding the file was read with
+            df (pd.DataFrame): DataFrame returned by the PyArrow CSV reader
+            
+        Returns:
+            pd.DataFrame: The data with date columns as the default engine reads them
+            
+        Raises:
+            ValueError: If a date column's name is not unique in the PyArrow header
+        """
+        date_cols = []
+        for i, name in enumerate(df.columns):
+            values = df.iloc[:, i]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                date_cols.append(name)
+            elif values.dtype == object:
+                values = values.dropna()
+                if len(values) and isinstance(values.iloc[0], date):
+                    date_cols.append(name)
+        if not date_cols:
+            return df
+        if df.columns[df.columns.duplicated(keep=False)].isin(date_cols).any():
+            raise ValueError("Cannot re-read a date column with a repeated name")
+        
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        table = pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=date_cols,
+                column_types=dict.fromkeys(date_cols, pa.string()),
+                null_values=_CSV_NA_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+        for name in date_cols:
+            df[name] = table.column(name).to_pandas().fillna(np.nan).to_numpy()
+        return df
+    
+    @staticmethod
+    def _has_undecoded_bytes(df):
+        """
+        Check whether any text column came back as raw bytes.
+        
+        Args:
+            df (pd.DataFrame): DataFrame returned by the PyArrow CSV reader
+            
+        Returns:
+            bool: True if a column could not be decoded with the requested encoding
+        """
+        for i in range(df.shape[1]):
+            values = df.iloc[:, i]
+            if values.dtype == object:
+                values = values.dropna()
+                if len(values) and isinstance(values.iloc[0], bytes):
+                    return True
+        return False
+    
+    def _read_any(self, path, wanted=None):
+        """
+        Load an Excel or CSV file, choosing the reader from the file extension.
+        In minimal mode only the wanted columns are parsed.
+        
+        Args:
+            path (str): Path to the Excel/CSV file
+            wanted (list): Configured column names to keep in minimal mode
+            
+        Returns:
+            pd.DataFrame: The loaded data
+        """
+        if path.lower().endswith('.xlsx') or path.lower().endswith('.xls'):
+            reader = self._read_excel
+        elif path.lower().endswith('.csv'):
+            reader = self._read_csv
+        else:
+            raise ValueError(f"Unsupported file format: {path}")
+        
+        usecols = None
+        if self.minimal and wanted:
+            # Header-only probe; kept silent so each CSV is reported once
+            probe_kwargs = {'quiet': True} if reader == self._read_csv else {}
+            header = reader(path, nrows=0, **probe_kwargs).columns
+            usecols = self._usecols_for(header, wanted)
+        return reader(path, usecols=usecols)
+    
+    @staticmethod
+    def _usecols_for(header, wanted):
+        """
+        Pick the columns to load from a file when running in minimal mode.
+        
+        If any wanted column is missing from the header, every column is loaded
+        so the keyword/positional column fallbacks still work.
+        
+        Args:
+            header (pd.Index): Column names read from the file header
+            wanted (list): Configured column names to keep
+            
+        Returns:
+            list or None: Header names to pass as usecols, or None to load all columns
+        """
+        wanted = {str(col).strip() for col in wanted}
+        usecols = [col for col in header if str(col).strip() in wanted]
+        if {str(col).strip() for col in usecols} != wanted:
+            return None
+        return usecols
+    
     def load_data(self):
         """
         Load bank and ledger files with support for both Excel and CSV formats.
@@ -56,22 +364,8 @@ class ReconciliationScript:
         print(f"Loading Bank Statement (BASE): {self.bank_file_path}")
         
         # Load bank file
-        if self.bank_file_path.lower().endswith('.xlsx') or self.bank_file_path.lower().endswith('.xls'):
-            self.bank_df = pd.read_excel(self.bank_file_path)
-        elif self.bank_file_path.lower().endswith('.csv'):
-            # Try different encodings for CSV files
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    self.bank_df = pd.read_csv(self.bank_file_path, encoding=encoding)
-                    print(f"Successfully loaded CSV with {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Could not load CSV file with any of the attempted encodings")
-        else:
-            raise ValueError(f"Unsupported file format: {self.bank_file_path}")
+        self.bank_df = self._read_any(
+            self.bank_file_path, [self.bank_date_col, self.bank_credit_col, self.bank_debit_col])
         
         print(f"Bank Statement shape: {self.bank_df.shape}")
         print(f"Bank Statement columns: {list(self.bank_df.columns)}")
@@ -83,22 +377,8 @@ class ReconciliationScript:
         print(f"\nLoading Ledger file: {self.ledger_file_path}")
         
         # Load ledger file
-        if self.ledger_file_path.lower().endswith('.xlsx') or self.ledger_file_path.lower().endswith('.xls'):
-            self.ledger_df = pd.read_excel(self.ledger_file_path)
-        elif self.ledger_file_path.lower().endswith('.csv'):
-            # Try different encodings for CSV files
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    self.ledger_df = pd.read_csv(self.ledger_file_path, encoding=encoding)
-                    print(f"Successfully loaded CSV with {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Could not load CSV file with any of the attempted encodings")
-        else:
-            raise ValueError(f"Unsupported file format: {self.ledger_file_path}")
+        self.ledger_df = self._read_any(
+            self.ledger_file_path, [self.ledger_date_col, self.ledger_credit_col, self.ledger_debit_col])
         
         print(f"Ledger shape: {self.ledger_df.shape}")
         print(f"Ledger columns: {list(self.ledger_df.columns)}")
@@ -153,6 +433,38 @@ class ReconciliationScript:
         else:
             return value
     
+    def _resolve_column(self, columns, lc_names, wanted, keywords, fallback_idx, role, file_label):
+        """
+        Resolve a configured column name against a dataframe's columns.
+        
+        Args:
+            columns (pd.Index): The dataframe's columns
+            lc_names (list): Lowercase names of those columns, in the same order
+            wanted (str): The configured column name
+            keywords (list): Keywords that identify a suitable replacement column
+            fallback_idx (int): Position of the column to use if no keyword matches
+            role (str): Column role used in messages ('date', 'credit', 'debit')
+            file_label (str): File label used in messages ('bank', 'ledger')
+            
+        Returns:
+            The configured column if present, otherwise the first column whose name
+            contains one of the keywords, otherwise the column at fallback_idx
+        """
+        if wanted in columns:
+            return wanted
+        
+        print(f"Warning: Expected {role} column '{wanted}' not found in {file_label} file. Available columns: {list(columns)}")
+        for lc, orig in zip(lc_names, columns):
+            if any(keyword in lc for keyword in keywords):
+                print(f"Using '{orig}' as {role} column for {file_label} file")
+                return orig
+        
+        if len(columns) > fallback_idx:
+            position = ['first', 'second'][fallback_idx]
+            print(f"Using {position} column '{columns[fallback_idx]}' as {role} column for {file_label} file")
+            return columns[fallback_idx]
+        return wanted
+    
     def reconcile_with_status(self):
         """
         Perform matching between bank and ledger records and generate status.
@@ -165,57 +477,19 @@ class ReconciliationScript:
         bank_df = self.bank_df.copy()
         ledger_df = self.ledger_df.copy()
         
-        # Add temporary columns for matching using dynamic column names
-        # Check if the expected columns exist
-        if self.bank_date_col not in bank_df.columns:
-            print(f"Warning: Expected date column '{self.bank_date_col}' not found in bank file. Available columns: {list(bank_df.columns)}")
-            # Try to find a date-like column (look for common date column names)
-            date_cols = [col for col in bank_df.columns if any(keyword in col.lower() for keyword in ['date', 'value', 'trans', 'time', 'period'])]
-            if date_cols:
-                self.bank_date_col = date_cols[0]  # Use the first potential date column
-                print(f"Using '{self.bank_date_col}' as date column for bank file")
-            else:
-                # If no date-like column found, use the first column as default
-                self.bank_date_col = bank_df.columns[0]
-                print(f"Using first column '{self.bank_date_col}' as date column for bank file")
-        
-        if self.ledger_date_col not in ledger_df.columns:
-            print(f"Warning: Expected date column '{self.ledger_date_col}' not found in ledger file. Available columns: {list(ledger_df.columns)}")
-            # Try to find a date-like column
-            date_cols = [col for col in ledger_df.columns if any(keyword in col.lower() for keyword in ['date', 'value', 'trans', 'time', 'period'])]
-            if date_cols:
-                self.ledger_date_col = date_cols[0]  # Use the first potential date column
-                print(f"Using '{self.ledger_date_col}' as date column for ledger file")
-            else:
-                # If no date-like column found, use the first column as default
-                self.ledger_date_col = ledger_df.columns[0]
-                print(f"Using first column '{self.ledger_date_col}' as date column for ledger file")
-
-        if self.bank_credit_col not in bank_df.columns:
-            print(f"Warning: Expected credit column '{self.bank_credit_col}' not found in bank file.")
-            # Try to find a credit-like column
-            credit_cols = [col for col in bank_df.columns if any(keyword in col.lower() for keyword in ['credit', 'cr', 'amount', 'value'])]
-            if credit_cols:
-                self.bank_credit_col = credit_cols[0]
-                print(f"Using '{self.bank_credit_col}' as credit column for bank file")
-            else:
-                # If no credit-like column found, use the second column as default (assuming first is date)
-                if len(bank_df.columns) > 1:
-                    self.bank_credit_col = bank_df.columns[1]
-                    print(f"Using second column '{self.bank_credit_col}' as credit column for bank file")
-        
-        if self.ledger_debit_col not in ledger_df.columns:
-            print(f"Warning: Expected debit column '{self.ledger_debit_col}' not found in ledger file.")
-            # Try to find a debit-like column
-            debit_cols = [col for col in ledger_df.columns if any(keyword in col.lower() for keyword in ['debit', 'dr', 'amount', 'value'])]
-            if debit_cols:
-                self.ledger_debit_col = debit_cols[0]
-                print(f"Using '{self.ledger_debit_col}' as debit column for ledger file")
-            else:
-                # If no debit-like column found, use the second column as default (assuming first is date)  
-                if len(ledger_df.columns) > 1:
-                    self.ledger_debit_col = ledger_df.columns[1]
-                    print(f"Using second column '{self.ledger_debit_col}' as debit column for ledger file")
+        # Resolve the date/amount columns, falling back to keyword lookups on
+        # lowercase column names computed once per frame
+        bank_lc = [str(c).lower() for c in bank_df.columns]
+        ledger_lc = [str(c).lower() for c in ledger_df.columns]
+        
+        self.bank_date_col = self._resolve_column(
+            bank_df.columns, bank_lc, self.bank_date_col, ['date', 'value', 'trans', 'time', 'period'], 0, 'date', 'bank')
+        self.ledger_date_col = self._resolve_column(
+            ledger_df.columns, ledger_lc, self.ledger_date_col, ['date', 'value', 'trans', 'time', 'period'], 0, 'date', 'ledger')
+        self.bank_credit_col = self._resolve_column(
+            bank_df.columns, bank_lc, self.bank_credit_col, ['credit', 'cr', 'amount', 'value'], 1, 'credit', 'bank')
+        self.ledger_debit_col = self._resolve_column(
+            ledger_df.columns, ledger_lc, self.ledger_debit_col, ['debit', 'dr', 'amount', 'value'], 1, 'debit', 'ledger')
         
         # Add temporary columns for matching
         bank_df['temp_date'] = pd.to_datetime(bank_df[self.bank_date_col], errors='coerce')
@@ -227,51 +501,50 @@ class ReconciliationScript:
             bank_df['temp_amount'] = pd.to_numeric(bank_df[self.bank_credit_col], errors='coerce')
             ledger_df['temp_amount'] = pd.to_numeric(ledger_df[self.ledger_debit_col], errors='coerce')
             
-            # Create temporary matching keys
-            bank_df['temp_key'] = bank_df['temp_date'].dt.strftime('%Y-%m-%d') + '_' + bank_df['temp_amount'].astype(str)
-            ledger_df['temp_key'] = ledger_df['temp_date'].dt.strftime('%Y-%m-%d') + '_' + ledger_df['temp_amount'].astype(str)
+            # Keep only rows with a valid date and amount, keyed by the transaction day
+            # and the amount in whole cents (exact integer equality, no float noise)
+            bank_valid = bank_df['temp_date'].notna() & np.isfinite(bank_df['temp_amount'])
+            ledger_valid = ledger_df['temp_date'].notna() & np.isfinite(ledger_df['temp_amount'])
+            bank_keys = pd.DataFrame({
+                'bank_idx': bank_df.index[bank_valid],
+                'day': bank_df.loc[bank_valid, 'temp_date'].to_numpy().astype('datetime64[D]'),
+                'cents': np.rint(bank_df.loc[bank_valid, 'temp_amount'].to_numpy(dtype=np.float64) * 100).astype(np.int64),
+            })
+            ledger_keys = pd.DataFrame({
+                'ledger_idx': ledger_df.index[ledger_valid],
+                'day': ledger_df.loc[ledger_valid, 'temp_date'].to_numpy().astype('datetime64[D]'),
+                'cents': np.rint(ledger_df.loc[ledger_valid, 'temp_amount'].to_numpy(dtype=np.float64) * 100).astype(np.int64),
+            })
             
-            # Find matches - only match non-null values
-            matches = pd.merge(
-                bank_df.reset_index().rename(columns={'index': 'bank_idx'}),
-                ledger_df.reset_index().rename(columns={'index': 'ledger_idx'}),
-                left_on='temp_key',
-                right_on='temp_key',
-                how='inner'
-            )
+            # Factorize the exact (day, cents) pairs of both sides into shared dense codes:
+            # each part is factorized on its own, combined without overflow, then re-densified
+            day_codes, _ = pd.factorize(
+                np.concatenate([bank_keys['day'].to_numpy(), ledger_keys['day'].to_numpy()]))
+            cent_codes, cent_uniques = pd.factorize(
+                np.concatenate([bank_keys['cents'].to_numpy(), ledger_keys['cents'].to_numpy()]))
+            codes, _ = pd.factorize(day_codes.astype(np.int64) * len(cent_uniques) + cent_codes)
+            bank_codes = codes[:len(bank_keys)]
+            ledger_codes = codes[len(bank_keys):]
             
-            # Filter out rows where date or amount was null (resulted in NaT or NaN)
-            matches = matches[
-                (matches['temp_date_x'].notna()) & 
-                (matches['temp_date_y'].notna()) & 
-                (matches['temp_amount_x'].notna()) & 
-                (matches['temp_amount_y'].notna())
-            ]
+            # One-to-one matching: each bank row takes the first unused ledger row with its key
+            bank_pos, ledger_pos = _greedy_match(bank_codes, ledger_codes)
             
             # Get matched indices
-            matched_bank_indices = matches['bank_idx'].tolist()
-            matched_ledger_indices = matches['ledger_idx'].tolist()
+            matched_bank_indices = bank_keys['bank_idx'].to_numpy()[bank_pos].tolist()
+            matched_ledger_indices = ledger_keys['ledger_idx'].to_numpy()[ledger_pos].tolist()
         else:
             # If columns don't exist, no matches can be found
             matched_bank_indices = []
             matched_ledger_indices = []
         
-        # Create status lists based on matches
-        bank_statuses = []
-        ledger_statuses = []
-        
-        # Initialize all records as unmatched
-        for i in range(len(bank_df)):
-            if i in matched_bank_indices:
-                bank_statuses.append("Matched with Ledger")
-            else:
-                bank_statuses.append("Unmatched with Ledger")
-        
-        for i in range(len(ledger_df)):
-            if i in matched_ledger_indices:
-                ledger_statuses.append("Matched with Bank")
-            else:
-                ledger_statuses.append("Unmatched with Bank")
+        # Build status columns from boolean match masks; stored as categoricals
+        # (one int8 code per row) since each side only has two status values
+        bank_matched = bank_df.index.isin(matched_bank_indices)
+        ledger_matched = ledger_df.index.isin(matched_ledger_indices)
+        bank_statuses = pd.Categorical.from_codes(
+            bank_matched.astype(np.int8), categories=['Unmatched with Ledger', 'Matched with Ledger'])
+        ledger_statuses = pd.Categorical.from_codes(
+            ledger_matched.astype(np.int8), categories=['Unmatched with Bank', 'Matched with Bank'])
         
         # Store results
         self.matched_bank_indices = matched_bank_indices
@@ -429,10 +702,23 @@ def main():
     """
     Main function that reads configuration from .env file.
     """
-    # Read file paths from environment variables
-    BANK_FILE = os.getenv('BANK_STATEMENT_FILE_PATH', 'sample_bank_statement.xlsx')
-    LEDGER_FILE = os.getenv('LEDGER_FILE_PATH', 'sample_ledger.xlsx')
-    OUTPUT_FILE = os.getenv('OUTPUT_FILE_PATH', 'Reconciliation_Results.xlsx')
+    parser = argparse.ArgumentParser(description='Reconcile a bank statement against a ledger')
+    parser.add_argument('--bank-file', help='Path to the bank statement file (overrides .env value)')
+    parser.add_argument('--reference-file', help='Path to the ledger file (overrides .env value)')
+    parser.add_argument('--output-file', help='Path for the output file (overrides .env value)')
+    parser.add_argument('--minimal', action='store_true',
+                        help='Load and output only the date/credit/debit columns')
+    # Deprecated: matching always uses the date and amount columns configured in .env
+    parser.add_argument('--columns', nargs='*', help='Deprecated and ignored')
+    parser.add_argument('--no-header-check', action='store_true', help='Deprecated and ignored')
+    args = parser.parse_args()
+    if args.columns is not None or args.no_header_check:
+        print("Ignoring deprecated --columns/--no-header-check; matching uses the columns configured in .env")
+    
+    # Read file paths from the command line, falling back to environment variables
+    BANK_FILE = args.bank_file or os.getenv('BANK_STATEMENT_FILE_PATH', 'sample_bank_statement.xlsx')
+    LEDGER_FILE = args.reference_file or os.getenv('LEDGER_FILE_PATH', 'sample_ledger.xlsx')
+    OUTPUT_FILE = args.output_file or os.getenv('OUTPUT_FILE_PATH', 'Reconciliation_Results.xlsx')
     
     # Read column mappings from environment variables (for files with generic column names)
     BANK_DATE_COL = os.getenv('BANK_DATE_COLUMN', 'Value Date')
@@ -444,7 +730,7 @@ def main():
     LEDGER_DEBIT_COL = os.getenv('LEDGER_DEBIT_COLUMN', 'Debit')
     
     # Create and run the reconciliation script
-    reconciler = ReconciliationScript(BANK_FILE, LEDGER_FILE, OUTPUT_FILE)
+    reconciler = ReconciliationScript(BANK_FILE, LEDGER_FILE, OUTPUT_FILE, minimal=args.minimal)
     reconciler.bank_date_col = BANK_DATE_COL
     reconciler.bank_credit_col = BANK_CREDIT_COL
     reconciler.bank_debit_col = BANK_DEBIT_COL
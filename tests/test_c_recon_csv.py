@@ -0,0 +1,68 @@
+"""The Polars CSV path in update_1/C_Recon.py must reconcile exactly like the pandas one"""
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pl = pytest.importorskip('polars')
+
+_SPEC = importlib.util.spec_from_file_location(
+    'C_Recon', Path(__file__).resolve().parents[1] / 'update_1' / 'C_Recon.py')
+C_Recon = sys.modules['C_Recon'] = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(C_Recon)
+
+# Preamble row, a blank line and N/A / NULL cells, which pandas and Polars read differently by default
+BANK_CSV = """Statement,,
+Value Date,Credit,Narration
+2024-01-05,100.00,first
+2024-01-06,N/A,second
+
+2024-01-07,250.50,NULL
+"""
+LEDGER_CSV = """Ledger,,
+Value Date,Debit,Memo
+2024-01-05,100.00,a
+2024-01-08,75.00,b
+2024-01-07,N/A,c
+"""
+
+
+def _run(tmp_path, monkeypatch, use_polars, tag):
+    monkeypatch.setattr(C_Recon, 'pl', pl if use_polars else None)
+    bank, ledger = tmp_path / 'bank.csv', tmp_path / 'ledger.csv'
+    bank.write_text(BANK_CSV)
+    ledger.write_text(LEDGER_CSV)
+    out = tmp_path / f'out_{tag}.xlsx'
+    C_Recon.perform_reconciliation(str(bank), str(ledger), str(out))
+    return pd.read_excel(out, sheet_name=None)
+
+
+@pytest.mark.parametrize('text', [BANK_CSV, LEDGER_CSV])
+def test_load_data_rows_matches_pandas(tmp_path, monkeypatch, text):
+    path = tmp_path / 'input.csv'
+    path.write_text(text)
+    loaded = C_Recon.load_data_rows(str(path), 'bank' if 'Credit' in text else 'ledger')
+    monkeypatch.setattr(C_Recon, 'pl', None)
+    expected = C_Recon.load_data_rows(str(path), 'bank' if 'Credit' in text else 'ledger')
+
+    assert loaded[1] == expected[1]
+    assert list(loaded[0].columns) == list(expected[0].columns)
+    pd.testing.assert_frame_equal(
+        loaded[0].fillna(pd.NA).reset_index(drop=True),
+        expected[0].fillna(pd.NA).reset_index(drop=True),
+        check_dtype=False, check_names=False)
+
+
+def test_reconciliation_matches_pandas(tmp_path, monkeypatch):
+    with_polars = _run(tmp_path, monkeypatch, True, 'polars')
+    with_pandas = _run(tmp_path, monkeypatch, False, 'pandas')
+
+    assert with_polars.keys() == with_pandas.keys()
+    for name in with_pandas:
+        pd.testing.assert_frame_equal(with_polars[name], with_pandas[name])
+    # The blank line is not a record: three bank rows, only the 2024-01-05 one matches
+    summary = with_pandas['Summary']
+    bank = summary.iloc[summary.index[summary['Metric'] == 'BANK STATEMENT'][0] + 1:]
+    assert bank['Value'].iloc[:3].astype(int).tolist() == [3, 1, 2]
@@ -5,94 +5,224 @@ import os
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Explicitly load .env file
-script_dir = Path(__file__).parent
-env_path = script_dir / '.env'
-print(f"Explicitly loading .env file from: {env_path.absolute()}")
-load_dotenv(env_path, override=True)
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import xlsxwriter  # noqa: F401
+    _EXCEL_ENGINE = 'xlsxwriter'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
+
+# Cell values pd.read_csv treats as missing, and the ones it parses as booleans
+_PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                     '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+_PANDAS_BOOL_VALUES = ['True', 'TRUE', 'true', 'False', 'FALSE', 'false']
+
+# Thousands separators and spaces stripped from amount cells before parsing
+_AMOUNT_TBL = str.maketrans({',': None, ' ': None})
+
+def _norm_cols(cols):
+    """Return the stripped, lowercased names of the given columns"""
+    return [str(c).strip().lower() for c in cols]
 
 
 def find_value_date_and_amount_columns(df, file_type):
     """Locate date and amount columns in the dataframe"""
-    date_col, amount_col = None, None
+    norm_cols = _norm_cols(df.columns)
 
-    # Locate Value Date
-    for col in df.columns:
-        if str(col).strip().lower() == 'value date':
-            date_col = col
-            break
+    # Normalized name -> first column with it, and compact name (no spaces/underscores) -> (position, column)
+    exact = {}
+    compact = {}
+    for pos, (name, col) in enumerate(zip(norm_cols, df.columns)):
+        exact.setdefault(name, col)
+        compact.setdefault(name.replace(' ', '').replace('_', ''), (pos, col))
 
+    def first_compact_match(candidates):
+        # Earliest column matching any candidate, as a left-to-right scan would find
+        hits = [compact[name] for name in candidates if name in compact]
+        return min(hits, key=lambda hit: hit[0])[1] if hits else None
+
+    # Locate Value Date
+    date_col = exact.get('value date')
     if date_col is None:
-        for col in df.columns:
-            col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-            if col_clean in ['valuedate', 'value_date', 'date', 'transdate', 'transactiondate']:
-                date_col = col
-                break
+        date_col = first_compact_match(('valuedate', 'value_date', 'date', 'transdate', 'transactiondate'))
 
     # Locate Credit/Debit column
+    amount_col = None
     if file_type == "bank":
-        for col in df.columns:
-            if str(col).strip().lower() == 'credit':
-                amount_col = col
-                break
+        amount_col = exact.get('credit')
         if amount_col is None:
-            for col in df.columns:
-                col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-                if col_clean in ['credit', 'cr', 'credits', 'amount']:
-                    amount_col = col
-                    break
+            amount_col = first_compact_match(('credit', 'cr', 'credits', 'amount'))
     elif file_type == "ledger":
-        for col in df.columns:
-            if str(col).strip().lower() == 'debit':
-                amount_col = col
-                break
+        amount_col = exact.get('debit')
         if amount_col is None:
-            for col in df.columns:
-                col_clean = str(col).strip().lower().replace(' ', '').replace('_', '')
-                if col_clean in ['debit', 'dr', 'debits', 'withdrawal', 'amount']:
-                    amount_col = col
-                    break
+            amount_col = first_compact_match(('debit', 'dr', 'debits', 'withdrawal', 'amount'))
 
     return date_col, amount_col
 
 
+def find_header_row(df, file_type):
+    """Return the position of the header row within the first 50 rows, or None"""
+    # Lowercase the 50-row block once and scan it column-wise
+    head = df.head(50).astype(str).apply(lambda col: col.str.lower())
+    amount_pattern = 'credit|debit' if file_type == "bank" else 'debit'
+    has_date = head.apply(lambda col: col.str.contains('date', regex=False)).any(axis=1)
+    has_amount = head.apply(lambda col: col.str.contains(amount_pattern)).any(axis=1)
+
+    is_header = (has_date & has_amount).to_numpy()
+    return int(is_header.argmax()) if is_header.any() else None
+
+
 def find_actual_data_rows(df, file_type):
     """Find the header row and extract actual data"""
-    header_row = None
-    for i in range(min(50, len(df))):
-        row_values = df.iloc[i].astype(str).str.lower()
-        has_date = any('date' in val for val in row_values)
-        if file_type == "bank":
-            has_amount = any('credit' in val or 'debit' in val for val in row_values)
-        else:
-            has_amount = any('debit' in val for val in row_values)
-        if has_date and has_amount:
-            header_row = i
-            break
+    header_row = find_header_row(df, file_type)
 
     if header_row is None:
         print("WARNING: Could not find header row in data")
         return df, 0
 
-    df_with_headers = df.iloc[header_row:].copy()
-    df_with_headers.columns = df_with_headers.iloc[0]
-    df_data = df_with_headers.iloc[1:].reset_index(drop=True)
+    df_data = df.iloc[header_row + 1:].reset_index(drop=True)
+    df_data.columns = df.iloc[header_row]
     return df_data, header_row
 
 
+def _collect_streaming(lazy):
+    """Collect a Polars LazyFrame with the streaming engine, or in memory on Polars versions without it"""
+    try:
+        return lazy.collect(engine='streaming')
+    except (TypeError, ValueError):
+        # Older Polars releases have no engine argument or no 'streaming' engine
+        return lazy.collect()
+
+
+def _polars_matches_pandas(df):
+    """Check that a raw all-string Polars frame reads the same as pd.read_csv(header=None) would"""
+    blank = [pl.col(c).is_null() | (pl.col(c).str.strip_chars() == '') for c in df.columns]
+    # pandas gives a column a numeric/bool dtype when all its values parse; Polars keeps strings
+    has_text = [
+        (pl.col(c).is_not_null()
+         & pl.col(c).str.strip_chars().cast(pl.Float64, strict=False).is_null()
+         & ~pl.col(c).is_in(_PANDAS_BOOL_VALUES)).any()
+        for c in df.columns
+    ]
+    checks = df.select(pl.all_horizontal(blank).any().alias('blank_row'), *has_text).row(0)
+    # Blank lines are skipped by pandas but come through Polars as empty rows
+    return not checks[0] and all(checks[1:])
+
+
+def load_data_rows(path, file_type):
+    """Load a bank/ledger file and return its data rows under the detected header"""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return find_actual_data_rows(pd.read_excel(path, header=None), file_type)
+    if pl is not None:
+        # Parse every cell as a string with pandas' missing-value markers, and only use the
+        # result when it reads the same as pandas would; otherwise use pandas below
+        try:
+            df = _collect_streaming(
+                pl.scan_csv(path, has_header=False, infer_schema_length=0, null_values=_PANDAS_NA_VALUES))
+        except pl.exceptions.ComputeError:
+            # Ragged rows and similar; let pandas read it or report the problem
+            df = None
+        if df is not None and _polars_matches_pandas(df):
+            header_row = find_header_row(df.head(50).to_pandas(), file_type)
+            if header_row is None:
+                print("WARNING: Could not find header row in data")
+                df_all = df.to_pandas()
+                df_all.columns = range(df_all.shape[1])
+                return df_all, 0
+            df_data = df.slice(header_row + 1).to_pandas()
+            df_data.columns = [np.nan if name is None else name for name in df.row(header_row)]
+            return df_data, header_row
+    return find_actual_data_rows(pd.read_csv(path, header=None), file_type)
+
+
+def parse_amounts(series):
+    """Parse an amount column to float64, coercing unparseable cells to NaN"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+    return pd.to_numeric(series.astype(str).str.translate(_AMOUNT_TBL), errors='coerce')
+
+
+def _to_dt(series):
+    """Parse a date column once per distinct value, passing through columns that are already datetime64"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    codes, uniques = pd.factorize(series)
+    parsed = pd.to_datetime(uniques, errors='coerce')
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index)
+
+
+def build_match_keys(date_series, amount_series):
+    """Return positions of rows with a valid date and nonzero amount, with their day and cent keys"""
+    days = _to_dt(date_series).values.astype('datetime64[D]')
+    amounts = parse_amounts(amount_series).to_numpy()
+
+    positions = np.flatnonzero(~np.isnat(days) & np.isfinite(amounts))
+    cents = np.rint(np.abs(amounts[positions]) * 100).astype(np.int64)
+    nonzero = cents != 0
+    positions = positions[nonzero]
+    return positions, days[positions].view(np.int64), cents[nonzero]
+
+
+def pack_match_keys(bank_days, bank_cents, ledger_days, ledger_cents):
+    """Combine the (day, cents) pairs of both sides into collision-free single int64 keys"""
+    days = np.concatenate([bank_days, ledger_days])
+    if days.size == 0:
+        return days, days
+    # Dense codes for the amounts keep (day offset, amount code) packable without overflow
+    cent_codes, cent_uniques = pd.factorize(np.concatenate([bank_cents, ledger_cents]))
+    keys = (days - days.min()) * len(cent_uniques) + cent_codes
+    return keys[:len(bank_days)], keys[len(bank_days):]
+
+
+def match_keys(bank_keys, ledger_keys):
+    """Flag bank and ledger rows whose key appears on the other side"""
+    if njit is not None:
+        return _match_keys_jit(
+            np.ascontiguousarray(bank_keys, dtype=np.int64),
+            np.ascontiguousarray(ledger_keys, dtype=np.int64),
+        )
+    return np.isin(bank_keys, ledger_keys), np.isin(ledger_keys, bank_keys)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _match_keys_jit(bank_keys, ledger_keys):
+        """Compiled hash-probe version of match_keys"""
+        seen = dict()
+        for i in range(bank_keys.size):
+            seen[bank_keys[i]] = False
+
+        ledger_hit = np.zeros(ledger_keys.size, dtype=np.bool_)
+        for j in range(ledger_keys.size):
+            key = ledger_keys[j]
+            if key in seen:
+                seen[key] = True
+                ledger_hit[j] = True
+
+        bank_hit = np.empty(bank_keys.size, dtype=np.bool_)
+        for i in range(bank_keys.size):
+            bank_hit[i] = seen[bank_keys[i]]
+        return bank_hit, ledger_hit
+
+
 def perform_reconciliation(bank_file, ledger_file, output_file):
     """Main reconciliation function with enhanced summary"""
     print("=" * 70)
     print("BANK RECONCILIATION SYSTEM - ENHANCED VERSION")
     print("=" * 70)
 
-    # Load files
-    bank_df_raw = pd.read_excel(bank_file, header=None) if bank_file.lower().endswith(('.xlsx', '.xls')) else pd.read_csv(bank_file, header=None)
-    ledger_df_raw = pd.read_excel(ledger_file, header=None) if ledger_file.lower().endswith(('.xlsx', '.xls')) else pd.read_csv(ledger_file, header=None)
-
-    # Extract valid data
-    bank_df, _ = find_actual_data_rows(bank_df_raw, "bank")
-    ledger_df, _ = find_actual_data_rows(ledger_df_raw, "ledger")
+    # Load files and extract valid data
+    bank_df, _ = load_data_rows(bank_file, "bank")
+    ledger_df, _ = load_data_rows(ledger_file, "ledger")
 
     print(f"\nBank records: {len(bank_df)}")
     print(f"Ledger records: {len(ledger_df)}")
@@ -110,122 +240,88 @@ def perform_reconciliation(bank_file, ledger_file, output_file):
     print(f"[SUCCESS] Ledger Date Column: {ledger_date_col}")
     print(f"[SUCCESS] Ledger Debit Column: {ledger_debit_col}")
 
-    # Prepare data
-    bank_work = bank_df.copy()
-    ledger_work = ledger_df.copy()
-
-    bank_work['clean_date'] = pd.to_datetime(bank_work[bank_date_col], errors='coerce')
-    ledger_work['clean_date'] = pd.to_datetime(ledger_work[ledger_date_col], errors='coerce')
-
-    bank_work['internal_amount'] = pd.to_numeric(bank_work[bank_credit_col].astype(str).str.replace(',', '').str.replace(' ', ''), errors='coerce')
-    ledger_work['internal_amount'] = pd.to_numeric(ledger_work[ledger_debit_col].astype(str).str.replace(',', '').str.replace(' ', ''), errors='coerce')
-
-    bank_work['match_date'] = bank_work['clean_date'].dt.strftime('%Y-%m-%d')
-    ledger_work['match_date'] = ledger_work['clean_date'].dt.strftime('%Y-%m-%d')
-
-    bank_work['match_amount'] = bank_work['internal_amount'].abs().round(2)
-    ledger_work['match_amount'] = ledger_work['internal_amount'].abs().round(2)
-
-    bank_work['original_bank_index'] = bank_work.index
-    ledger_work['original_ledger_index'] = ledger_work.index
-
-    # Filter valid rows
-    bank_valid = bank_work.dropna(subset=['match_date', 'match_amount'])
-    ledger_valid = ledger_work.dropna(subset=['match_date', 'match_amount'])
-    bank_valid = bank_valid[bank_valid['match_amount'] != 0]
-    ledger_valid = ledger_valid[ledger_valid['match_amount'] != 0]
+    # Integer keys (calendar day + absolute amount in cents) for rows with a valid date and nonzero amount
+    bank_pos, bank_days, bank_cents = build_match_keys(bank_df[bank_date_col], bank_df[bank_credit_col])
+    ledger_pos, ledger_days, ledger_cents = build_match_keys(ledger_df[ledger_date_col], ledger_df[ledger_debit_col])
 
     print("\nPerforming reconciliation (Date + Amount matching)...")
 
-    # Merge on date + amount
-    matches = pd.merge(
-        bank_valid[['match_date', 'match_amount', 'original_bank_index']],
-        ledger_valid[['match_date', 'match_amount', 'original_ledger_index']],
-        on=['match_date', 'match_amount'],
-        how='inner'
-    )
+    # Match on date + amount
+    bank_keys, ledger_keys = pack_match_keys(bank_days, bank_cents, ledger_days, ledger_cents)
+    bank_hit, ledger_hit = match_keys(bank_keys, ledger_keys)
 
-    matched_bank_indices = set(matches['original_bank_index'])
-    matched_ledger_indices = set(matches['original_ledger_index'])
+    bank_matched_mask = np.zeros(len(bank_df), dtype=bool)
+    bank_matched_mask[bank_pos[bank_hit]] = True
+    ledger_matched_mask = np.zeros(len(ledger_df), dtype=bool)
+    ledger_matched_mask[ledger_pos[ledger_hit]] = True
 
     # Assign Status
-    bank_df['Status'] = np.where(bank_df.index.isin(matched_bank_indices), 'Matched', 'Unmatched')
-    ledger_df['Status'] = np.where(ledger_df.index.isin(matched_ledger_indices), 'Matched', 'Unmatched')
+    bank_df['Status'] = pd.Categorical.from_codes(bank_matched_mask.astype(np.int8), ['Unmatched', 'Matched'])
+    ledger_df['Status'] = pd.Categorical.from_codes(ledger_matched_mask.astype(np.int8), ['Unmatched', 'Matched'])
 
     # Calculate summary metrics
     total_bank = len(bank_df)
-    matched_bank_count = len(matched_bank_indices)
+    matched_bank_count = int(bank_matched_mask.sum())
     unmatched_bank_count = total_bank - matched_bank_count
     
     total_ledger = len(ledger_df)
-    matched_ledger_count = len(matched_ledger_indices)
+    matched_ledger_count = int(ledger_matched_mask.sum())
     unmatched_ledger_count = total_ledger - matched_ledger_count
 
+    # Match rates for both sides in one divide (0 for an empty side)
+    totals = np.array([total_bank, total_ledger])
+    bank_rate, ledger_rate = np.divide(
+        [matched_bank_count, matched_ledger_count], totals, out=np.zeros(2), where=totals > 0
+    ) * 100
+
     # Display summary
-    print(f"\nBank matched: {matched_bank_count}/{total_bank} ({(matched_bank_count/total_bank*100) if total_bank > 0 else 0:.2f}%)")
-    print(f"Ledger matched: {matched_ledger_count}/{total_ledger} ({(matched_ledger_count/total_ledger*100) if total_ledger > 0 else 0:.2f}%)")
+    print(f"\nBank matched: {matched_bank_count}/{total_bank} ({bank_rate:.2f}%)")
+    print(f"Ledger matched: {matched_ledger_count}/{total_ledger} ({ledger_rate:.2f}%)")
 
     # Save Excel output with enhanced summary
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_file, engine=_EXCEL_ENGINE) as writer:
         # Enhanced Summary Sheet
-        summary_data = [
-            {'Metric': 'RECONCILIATION SUMMARY', 'Value': ''},
-            {'Metric': 'Matching Strategy', 'Value': 'Date + Amount Matching'},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'BANK STATEMENT', 'Value': ''},
-            {'Metric': 'Total Records', 'Value': total_bank},
-            {'Metric': 'Matched', 'Value': matched_bank_count},
-            {'Metric': 'Unmatched', 'Value': unmatched_bank_count},
-            {'Metric': 'Match Rate', 'Value': f"{(matched_bank_count/total_bank*100) if total_bank > 0 else 0:.2f}%"},
-            {'Metric': '', 'Value': ''},
-            {'Metric': 'LEDGER', 'Value': ''},
-            {'Metric': 'Total Records', 'Value': total_ledger},
-            {'Metric': 'Matched', 'Value': matched_ledger_count},
-            {'Metric': 'Unmatched', 'Value': unmatched_ledger_count},
-            {'Metric': 'Match Rate', 'Value': f"{(matched_ledger_count/total_ledger*100) if total_ledger > 0 else 0:.2f}%"},
+        summary_rows = [
+            ('RECONCILIATION SUMMARY', ''),
+            ('Matching Strategy', 'Date + Amount Matching'),
+            ('', ''),
+            ('BANK STATEMENT', ''),
+            ('Total Records', total_bank),
+            ('Matched', matched_bank_count),
+            ('Unmatched', unmatched_bank_count),
+            ('Match Rate', f"{bank_rate:.2f}%"),
+            ('', ''),
+            ('LEDGER', ''),
+            ('Total Records', total_ledger),
+            ('Matched', matched_ledger_count),
+            ('Unmatched', unmatched_ledger_count),
+            ('Match Rate', f"{ledger_rate:.2f}%"),
         ]
-        summary_df = pd.DataFrame(summary_data)
+        metrics, values = zip(*summary_rows)
+        summary_df = pd.DataFrame({'Metric': list(metrics), 'Value': list(values)})
         summary_df.to_excel(writer, sheet_name='Summary', index=False)
 
         # Function to insert 3 blank columns before Status
         def insert_blank_cols_before_status(df):
             if 'Status' in df.columns:
                 status_idx = df.columns.get_loc('Status')
-                # Create 3 new blank columns with different temporary names to avoid conflicts
-                df.insert(status_idx, 'temp_col_1', ['' for _ in range(len(df))])
-                df.insert(status_idx + 1, 'temp_col_2', ['' for _ in range(len(df))])
-                df.insert(status_idx + 2, 'temp_col_3', ['' for _ in range(len(df))])
-                # Rename them to empty strings, ensuring they're different
-                df.rename(columns={
-                    'temp_col_1': '', 
-                    'temp_col_2': ' ', 
-                    'temp_col_3': '  '
-                }, inplace=True)
+                blank = np.full(len(df), '', dtype=object)
+                # Distinct empty-looking names so the three columns don't collide
+                for offset, name in enumerate(['', ' ', '  ']):
+                    df.insert(status_idx + offset, name, blank, allow_duplicates=True)
             return df
 
-        # Bank Statement Sheets
-        bank_df_with_blanks = insert_blank_cols_before_status(bank_df.copy())
-        bank_df_with_blanks.to_excel(writer, sheet_name='Bank - All', index=False)
-        
-        bank_matched = bank_df[bank_df['Status'] == 'Matched'].copy()
-        bank_matched_with_blanks = insert_blank_cols_before_status(bank_matched)
-        bank_matched_with_blanks.to_excel(writer, sheet_name='Bank - Matched', index=False)
-        
-        bank_unmatched = bank_df[bank_df['Status'] == 'Unmatched'].copy()
-        bank_unmatched_with_blanks = insert_blank_cols_before_status(bank_unmatched)
-        bank_unmatched_with_blanks.to_excel(writer, sheet_name='Bank - Unmatched', index=False)
+        # Bank Statement Sheets (blanks inserted once, then sliced per sheet)
+        bank_with_blanks = insert_blank_cols_before_status(bank_df)
+        bank_with_blanks.to_excel(writer, sheet_name='Bank - All', index=False)
+        bank_with_blanks[bank_matched_mask].to_excel(writer, sheet_name='Bank - Matched', index=False)
+        bank_with_blanks[~bank_matched_mask].to_excel(writer, sheet_name='Bank - Unmatched', index=False)
 
         # Ledger Sheets
-        ledger_df_with_blanks = insert_blank_cols_before_status(ledger_df.copy())
-        ledger_df_with_blanks.to_excel(writer, sheet_name='Ledger - All', index=False)
-        
-        ledger_matched = ledger_df[ledger_df['Status'] == 'Matched'].copy()
-        ledger_matched_with_blanks = insert_blank_cols_before_status(ledger_matched)
-        ledger_matched_with_blanks.to_excel(writer, sheet_name='Ledger - Matched', index=False)
-        
-        ledger_unmatched = ledger_df[ledger_df['Status'] == 'Unmatched'].copy()
-        ledger_unmatched_with_blanks = insert_blank_cols_before_status(ledger_unmatched)
-        ledger_unmatched_with_blanks.to_excel(writer, sheet_name='Ledger - Unmatched', index=False)
+        ledger_with_blanks = insert_blank_cols_before_status(ledger_df)
+        ledger_with_blanks.to_excel(writer, sheet_name='Ledger - All', index=False)
+        ledger_with_blanks[ledger_matched_mask].to_excel(writer, sheet_name='Ledger - Matched', index=False)
+        ledger_with_blanks[~ledger_matched_mask].to_excel(writer, sheet_name='Ledger - Unmatched', index=False)
 
     print(f"\n[SUCCESS] Results saved to: {output_file}")
     print("\nSheets created:")
@@ -243,6 +339,12 @@ def perform_reconciliation(bank_file, ledger_file, output_file):
 
 def main():
     """Main entry point"""
+    # Load the .env next to this script unless the paths are already set in the environment
+    env_path = Path(__file__).parent / '.env'
+    if env_path.exists() and 'BANK_STATEMENT_FILE_PATH' not in os.environ:
+        print(f"Explicitly loading .env file from: {env_path.absolute()}")
+        load_dotenv(env_path, override=True)
+
     BANK_FILE = os.getenv('BANK_STATEMENT_FILE_PATH', 'sample_bank_statement.xlsx')
     LEDGER_FILE = os.getenv('LEDGER_FILE_PATH', 'sample_ledger.xlsx')
     OUTPUT_FILE = os.getenv('OUTPUT_FILE_PATH', 'Reconciliation_Results.xlsx')
@@ -277,9 +379,16 @@ if __name__ == "__main__":
 # import numpy as np
 # from datetime import datetime
 # import os
+# import re
 # from dotenv import load_dotenv
 # from pathlib import Path
 
+# try:
+#     import xlsxwriter  # noqa: F401
+#     _EXCEL_ENGINE = 'xlsxwriter'
+# except ImportError:
+#     _EXCEL_ENGINE = 'openpyxl'
+
 # # Explicitly load the .env file from the script directory first
 # script_dir = Path(__file__).parent
 # env_path = script_dir / '.env'
@@ -419,12 +528,16 @@ if __name__ == "__main__":
 #         'closing balance', 'opening balance', 'balance c/f', 'balance b/f', 
 #         'overall total', 'balance forward', 'balance carried forward'
 #     ]
+#     # One compiled alternation over all keywords: rows it doesn't hit can't be summaries
+#     summary_re = re.compile('|'.join(re.escape(keyword) for keyword in summary_keywords))
     
 #     non_summary_mask = pd.Series([True] * len(df_data), index=df_data.index)
     
 #     for idx, row in df_data.iterrows():
 #         row_str = ' '.join(str(val) for val in row.values if pd.notna(val))
 #         row_str_lower = row_str.lower()
+#         if summary_re.search(row_str_lower) is None:
+#             continue
         
 #         is_summary = False
 #         for keyword in summary_keywords:
@@ -666,11 +779,11 @@ if __name__ == "__main__":
 #     print(f"   ✓ Total matched after Pass 2: {len(matched_bank_indices)}")
     
 #     # ========== UPDATE STATUS ==========
-#     bank_df['Status'] = 'Unmatched'
-#     bank_df.loc[list(matched_bank_indices), 'Status'] = 'Matched'
+#     bank_matched_mask = bank_df.index.isin(list(matched_bank_indices))
+#     bank_df['Status'] = pd.Categorical.from_codes(bank_matched_mask.astype(np.int8), ['Unmatched', 'Matched'])
     
-#     ledger_df['Status'] = 'Unmatched'
-#     ledger_df.loc[list(matched_ledger_indices), 'Status'] = 'Matched'
+#     ledger_matched_mask = ledger_df.index.isin(list(matched_ledger_indices))
+#     ledger_df['Status'] = pd.Categorical.from_codes(ledger_matched_mask.astype(np.int8), ['Unmatched', 'Matched'])
     
 #     # Calculate statistics
 #     total_bank = len(bank_df)
@@ -680,6 +793,8 @@ if __name__ == "__main__":
 #     total_ledger = len(ledger_df)
 #     matched_ledger_count = len(matched_ledger_indices)
 #     unmatched_ledger_count = total_ledger - matched_ledger_count
+#     bank_rate = (matched_bank_count / total_bank * 100) if total_bank else 0.0
+#     ledger_rate = (matched_ledger_count / total_ledger * 100) if total_ledger else 0.0
     
 #     # ========== ANALYZE DUPLICATES ==========
 #     print("\n" + "="*70)
@@ -726,67 +841,69 @@ if __name__ == "__main__":
 #     print("SAMPLE UNMATCHED TRANSACTIONS")
 #     print("="*70)
     
-#     if len(unmatched_bank) > 0:
+#     if not unmatched_bank.empty:
 #         print(f"\nBank Unmatched (showing first 5 of {len(unmatched_bank)}):")
-#         for idx in unmatched_bank.head(5).index:
-#             date_val = bank_df.loc[idx, bank_date_col]
-#             amount_val = bank_df.loc[idx, bank_credit_col]
+#         sample = unmatched_bank.head(5)[[bank_date_col, bank_credit_col]]
+#         for date_val, amount_val in sample.itertuples(index=False, name=None):
 #             print(f"   Date: {date_val}, Amount: {amount_val}")
     
-#     if len(unmatched_ledger) > 0:
+#     if not unmatched_ledger.empty:
 #         print(f"\nLedger Unmatched (showing first 5 of {len(unmatched_ledger)}):")
-#         for idx in unmatched_ledger.head(5).index:
-#             date_val = ledger_df.loc[idx, ledger_date_col]
-#             amount_val = ledger_df.loc[idx, ledger_debit_col]
+#         sample = unmatched_ledger.head(5)[[ledger_date_col, ledger_debit_col]]
+#         for date_val, amount_val in sample.itertuples(index=False, name=None):
 #             print(f"   Date: {date_val}, Amount: {amount_val}")
     
 #     # ========== SAVE RESULTS ==========
 #     print(f"\n[SAVING] Saving results to: {output_file}")
     
-#     with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+#     with pd.ExcelWriter(output_file, engine=_EXCEL_ENGINE) as writer:
 #         # Summary sheet
-#         summary_data = [
-#             {'Metric': 'RECONCILIATION SUMMARY', 'Value': ''},
-#             {'Metric': 'Matching Strategy', 'Value': 'Multi-Pass with Duplicate Handling'},
-#             {'Metric': '', 'Value': ''},
-#             {'Metric': 'BANK STATEMENT', 'Value': ''},
-#             {'Metric': 'Total Records', 'Value': total_bank},
-#             {'Metric': 'Matched', 'Value': matched_bank_count},
-#             {'Metric': 'Unmatched', 'Value': unmatched_bank_count},
-#             {'Metric': 'Match Rate', 'Value': f"{(matched_bank_count/total_bank*100) if total_bank > 0 else 0:.2f}%"},
-#             {'Metric': '', 'Value': ''},
-#             {'Metric': 'LEDGER', 'Value': ''},
-#             {'Metric': 'Total Records', 'Value': total_ledger},
-#             {'Metric': 'Matched', 'Value': matched_ledger_count},
-#             {'Metric': 'Unmatched', 'Value': unmatched_ledger_count},
-#             {'Metric': 'Match Rate', 'Value': f"{(matched_ledger_count/total_ledger*100) if total_ledger > 0 else 0:.2f}%"},
+#         summary_rows = [
+#             ('RECONCILIATION SUMMARY', ''),
+#             ('Matching Strategy', 'Multi-Pass with Duplicate Handling'),
+#             ('', ''),
+#             ('BANK STATEMENT', ''),
+#             ('Total Records', total_bank),
+#             ('Matched', matched_bank_count),
+#             ('Unmatched', unmatched_bank_count),
+#             ('Match Rate', f"{bank_rate:.2f}%"),
+#             ('', ''),
+#             ('LEDGER', ''),
+#             ('Total Records', total_ledger),
+#             ('Matched', matched_ledger_count),
+#             ('Unmatched', unmatched_ledger_count),
+#             ('Match Rate', f"{ledger_rate:.2f}%"),
 #         ]
         
-#         summary_df = pd.DataFrame.from_records(summary_data)
+#         metrics, values = zip(*summary_rows)
+#         summary_df = pd.DataFrame({'Metric': list(metrics), 'Value': list(values)})
 #         summary_df.to_excel(writer, sheet_name='Summary', index=False)
         
-#         # Prepare columns for export
+#         # Prepare columns for export: drop the working columns and move Status last
+#         internal_cols = frozenset({'clean_date', 'internal_amount', 'match_date', 'match_amount', 'match_desc',
+#                                    'original_bank_index', 'original_ledger_index', 'temp_date', 'temp_amt'})
+        
 #         def prepare_columns(df):
-#             cols = [c for c in df.columns if c not in ['clean_date', 'internal_amount', 
-#                                                          'match_date', 'match_amount', 'match_desc',
-#                                                          'original_bank_index', 'original_ledger_index',
-#                                                          'temp_date', 'temp_amt']]
-#             if 'Status' in cols:
-#                 cols.remove('Status')
+#             cols = [c for c in df.columns if c not in internal_cols and c != 'Status']
+#             if 'Status' in df.columns:
 #                 cols.append('Status')
 #             return cols
         
 #         # Bank sheets
 #         bank_cols = prepare_columns(bank_df)
-#         bank_df[bank_cols].to_excel(writer, sheet_name='Bank Statement (All)', index=False)
-#         bank_df[bank_df['Status'] == 'Matched'][bank_cols].to_excel(writer, sheet_name='Bank - Matched', index=False)
-#         bank_df[bank_df['Status'] == 'Unmatched'][bank_cols].to_excel(writer, sheet_name='Bank - Unmatched', index=False)
+#         bank_export = bank_df[bank_cols]
+#         bank_export.to_excel(writer, sheet_name='Bank Statement (All)', index=False)
+#         bank_groups = dict(tuple(bank_export.groupby('Status', sort=False, observed=True)))
+#         bank_groups.get('Matched', bank_export.iloc[:0]).to_excel(writer, sheet_name='Bank - Matched', index=False)
+#         bank_groups.get('Unmatched', bank_export.iloc[:0]).to_excel(writer, sheet_name='Bank - Unmatched', index=False)
         
 #         # Ledger sheets
 #         ledger_cols = prepare_columns(ledger_df)
-#         ledger_df[ledger_cols].to_excel(writer, sheet_name='Ledger (All)', index=False)
-#         ledger_df[ledger_df['Status'] == 'Matched'][ledger_cols].to_excel(writer, sheet_name='Ledger - Matched', index=False)
-#         ledger_df[ledger_df['Status'] == 'Unmatched'][ledger_cols].to_excel(writer, sheet_name='Ledger - Unmatched', index=False)
+#         ledger_export = ledger_df[ledger_cols]
+#         ledger_export.to_excel(writer, sheet_name='Ledger (All)', index=False)
+#         ledger_groups = dict(tuple(ledger_export.groupby('Status', sort=False, observed=True)))
+#         ledger_groups.get('Matched', ledger_export.iloc[:0]).to_excel(writer, sheet_name='Ledger - Matched', index=False)
+#         ledger_groups.get('Unmatched', ledger_export.iloc[:0]).to_excel(writer, sheet_name='Ledger - Unmatched', index=False)
     
 #     print("\n[SUCCESS] Results saved successfully!")
 #     print("\n" + "="*70)